@@ -9,7 +9,9 @@ Copyright (C) 2017-2023 cyipopt developers
 License: EPL 2.0
 """
 
-import sys
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
 
 import numpy as np
 try:
@@ -20,7 +22,6 @@ else:
     SCIPY_INSTALLED = True
     del scipy
     from scipy import optimize
-    import scipy.sparse
     try:
         from scipy.optimize import OptimizeResult
     except ImportError:
@@ -42,6 +43,61 @@ else:
 import cyipopt
 
 
+class _FDJacobian(object):
+    """Forward difference approximation of the Jacobian of ``fun``.
+
+    Matches :py:func:`scipy.optimize.approx_fprime`, but reuses the value of
+    ``fun`` at ``x`` when it is already known and can evaluate the perturbed
+    points on a thread pool.
+
+    Parameters
+    ==========
+    fun : callable
+        The function to differentiate: ``fun(x, *args, **kwargs)``.
+    eps : float
+        Absolute step size.
+    executor : concurrent.futures.Executor, optional
+        Executor used to evaluate ``fun`` at the perturbed points. If
+        ``None`` (default), the points are evaluated serially, which is
+        required if ``fun`` is not thread-safe.
+    """
+
+    def __init__(self, fun, eps, executor=None):
+        self.fun = fun
+        self.eps = eps
+        self.executor = executor
+
+    def __call__(self, x, *args, **kwargs):
+        return self.differentiate(x, args, kwargs)
+
+    def differentiate(self, x, args=(), kwargs=None, f0=None):
+        kwargs = {} if kwargs is None else kwargs
+        x = np.asarray(x, dtype=float)
+        if f0 is None:
+            f0 = self.fun(x, *args, **kwargs)
+        f0 = np.asarray(f0, dtype=float)
+        # same step selection as `approx_fprime`: fall back to a relative
+        # step where `x + eps` rounds to `x`
+        h = np.full(x.shape, self.eps)
+        h = np.where((x + h) - x == 0,
+                     np.sqrt(np.finfo(float).eps) * np.where(x >= 0, 1, -1)
+                     * np.maximum(1.0, np.abs(x)),
+                     h)
+
+        def column(i):
+            x1 = x.copy()
+            x1[i] += h[i]
+            dx = x1[i] - x[i]
+            f1 = np.asarray(self.fun(x1, *args, **kwargs), dtype=float)
+            return (f1 - f0) / dx
+
+        if self.executor is not None and x.size > 1:
+            columns = list(self.executor.map(column, range(x.size)))
+        else:
+            columns = [column(i) for i in range(x.size)]
+        return np.array(columns).T
+
+
 class IpoptProblemWrapper(object):
     """Class used to map a scipy minimize definition to a cyipopt problem.
 
@@ -59,7 +115,8 @@ class IpoptProblemWrapper(object):
     jac : callable, optional
         The Jacobian (gradient) of the objective function:
         ``jac(x, *args, **kwargs) -> ndarray, shape(n, )``.
-        If ``None``, SciPy's ``approx_fprime`` is used.
+        If ``None``, a forward difference approximation (as in SciPy's
+        ``approx_fprime``) is used.
     hess : callable, optional
         If ``None``, the Hessian is computed using IPOPT's numerical methods.
         Explicitly defined Hessians are not yet supported for this class.
@@ -79,16 +136,27 @@ class IpoptProblemWrapper(object):
         function gradient and constraint Jacobian.
     con_dims : array_like, optional
         Dimensions p_1, ..., p_m of the m constraint functions
-        g_1, ..., g_m : R^n -> R^(p_i).
+        g_1, ..., g_m : R^n -> R^(p_i). Required if `constraints` is given.
     sparse_jacs: array_like, optional
         If sparse_jacs[i] = True, the i-th constraint's jacobian is sparse.
         Otherwise, the i-th constraint jacobian is assumed to be dense.
+        Required if `constraints` is given.
     jac_nnz_row: array_like, optional
         The row indices of the nonzero elements in the stacked
-        constraint jacobian matrix
+        constraint jacobian matrix. Required if `constraints` is given.
     jac_nnz_col: array_like, optional
         The column indices of the nonzero elements in the stacked
-        constraint jacobian matrix
+        constraint jacobian matrix. Required if `constraints` is given.
+    workers : int, optional
+        Number of threads used to evaluate the finite difference
+        approximations. ``-1`` uses all available CPUs. The default (1)
+        evaluates them serially; only use more if the functions are
+        thread-safe.
+
+    :py:func:`minimize_ipopt` computes `con_dims`, `sparse_jacs`,
+    `jac_nnz_row` and `jac_nnz_col` by evaluating the constraints at ``x0``.
+    The constraint and Jacobian values are stored in arrays allocated from
+    them, so a `ValueError` is raised if they do not match `constraints`.
     """
 
     def __init__(self,
@@ -103,7 +171,8 @@ class IpoptProblemWrapper(object):
                  con_dims=(),
                  sparse_jacs=(),
                  jac_nnz_row=(),
-                 jac_nnz_col=()):
+                 jac_nnz_col=(),
+                 workers=1):
         if not SCIPY_INSTALLED:
             msg = 'Install SciPy to use the `IpoptProblemWrapper` class.'
             raise ImportError()
@@ -113,11 +182,6 @@ class IpoptProblemWrapper(object):
         # Input validation of user-provided arguments
         if fun is not None and not callable(fun):
             raise ValueError('`fun` must be callable.')
-        if not isinstance(args, tuple):
-            args = (args,)
-        kwargs = dict() if kwargs is None else kwargs
-        if not isinstance(kwargs, dict):
-            raise ValueError('`kwargs` must be a dictionary.')
         if jac is not None and jac not in {True, False} and not callable(jac):
             raise ValueError('`jac` must be callable or boolean.')
         if hess is not None and not callable(hess):
@@ -125,25 +189,34 @@ class IpoptProblemWrapper(object):
         if hessp is not None:
             raise NotImplementedError(
                 '`hessp` is not yet supported by Ipopt.`')
+        if (isinstance(workers, bool)
+                or not isinstance(workers, (int, np.integer))
+                or (workers < 1 and workers != -1)):
+            raise ValueError('`workers` must be a positive integer or -1.')
         # TODO: add input validation for `constraints` when adding
         #  support for instances of new-style constraints (e.g.
         #  `NonlinearConstraint`) and sequences of constraints.
 
         if hess is not None:
             self.obj_hess = hess
+        # The finite difference approximations of the objective and all
+        # constraints share one thread pool, see `_shutdown_workers`.
+        if workers == -1:
+            workers = os.cpu_count() or 1
+        self._executor = (ThreadPoolExecutor(max_workers=workers)
+                          if workers > 1 else None)
+        self._fun_and_jac = None
         if not jac:
-            def jac(x, *args, **kwargs):
-                def wrapped_fun(x):
-                    return fun(x, *args, **kwargs)
-                return optimize.approx_fprime(x, wrapped_fun, eps)
+            jac = _FDJacobian(fun, eps, self._executor)
         elif jac is True:
+            # `fun` returns both the objective and its gradient, which are
+            # evaluated together in `_eval_fun_jac`.
+            self._fun_and_jac = fun
             fun = MemoizeJac(fun)
             jac = fun.derivative
 
         self.fun = fun
         self.jac = jac
-        self.args = args
-        self.kwargs = kwargs or {}
         self._constraint_funs = []
         self._constraint_jacs = []
         self._constraint_hessians = []
@@ -161,11 +234,7 @@ class IpoptProblemWrapper(object):
             con_hessian = con.get('hess', None)
             con_kwargs = con.get('kwargs', {})
             if con_jac is None:
-                # beware of late binding!
-                def con_jac(x, *args, con_fun=con_fun, **kwargs):
-                    def wrapped(x):
-                        return con_fun(x, *args, **kwargs)
-                    return optimize.approx_fprime(x, wrapped, eps)
+                con_jac = _FDJacobian(con_fun, eps, self._executor)
             elif con_jac is True:
                 con_fun = MemoizeJac(con_fun)
                 con_jac = con_fun.derivative
@@ -181,60 +250,200 @@ class IpoptProblemWrapper(object):
             self._constraint_hessians.append(con_hessian)
             self._constraint_args.append(con_args)
             self._constraint_kwargs.append(con_kwargs)
+        if not (len(self._constraint_dims) == len(sparse_jacs)
+                == len(self._constraint_funs)):
+            msg = ('`con_dims` and `sparse_jacs` must have one entry per '
+                   'constraint.')
+            raise ValueError(msg)
+        if len(jac_nnz_row) != len(jac_nnz_col):
+            msg = '`jac_nnz_row` and `jac_nnz_col` must have the same length.'
+            raise ValueError(msg)
+        # Preallocate the stacked constraint and Jacobian values. The i-th
+        # constraint fills `_con_buf[_con_offsets[i]:_con_offsets[i + 1]]`,
+        # and its Jacobian fills the analogous slice of `_jac_buf`.
+        self._con_offsets = np.concatenate(
+            ([0], np.cumsum(self._constraint_dims, dtype=int)))
+        self._con_buf = np.empty(self._con_offsets[-1])
+        jac_con_index = np.searchsorted(self._con_offsets,
+                                        np.asarray(jac_nnz_row, dtype=int),
+                                        side='right') - 1
+        jac_sizes = np.bincount(jac_con_index,
+                                minlength=len(self._constraint_dims))
+        self._jac_offsets = np.concatenate(([0], np.cumsum(jac_sizes)))
+        self._jac_buf = np.empty(self._jac_offsets[-1])
+        # Pair each constraint and Jacobian with the view of the buffer it
+        # fills, so that evaluating many small constraints does no index
+        # arithmetic. Dense Jacobians have the fixed shape (m_i, n) and are
+        # copied through a view with that shape.
+        self._con_steps = []
+        self._jac_steps = []
+        for i, (m_i, is_sparse) in enumerate(zip(
+                self._constraint_dims, self._constraint_jac_is_sparse)):
+            con_dest = self._con_buf[self._con_offsets[i]:
+                                     self._con_offsets[i + 1]]
+            jac_dest = self._jac_buf[self._jac_offsets[i]:
+                                     self._jac_offsets[i + 1]]
+            if not is_sparse:
+                jac_dest = (jac_dest.reshape(m_i, jac_sizes[i] // m_i)
+                            if m_i else None)
+            self._con_steps.append((self._constraint_funs[i],
+                                    self._constraint_args[i],
+                                    self._constraint_kwargs[i], con_dest))
+            self._jac_steps.append((self._constraint_jacs[i],
+                                    self._constraint_args[i],
+                                    self._constraint_kwargs[i], is_sparse,
+                                    jac_dest))
+        # The lower triangle indices and the buffer of the Hessian depend on
+        # the size of `x` and are set up at the first Hessian evaluation.
+        self._n = None
+        self._tril = None
+        self._H_buf = None
+        # validates and sets `args` and `kwargs`
+        self._reset(args, kwargs)
+
+    def _reset(self, args=(), kwargs=None):
+        """Set the extra arguments of the objective and clear the evaluation
+        counts and cached values, so that the wrapper can be reused for
+        another solve."""
+        if not isinstance(args, tuple):
+            args = (args,)
+        kwargs = dict() if kwargs is None else kwargs
+        if not isinstance(kwargs, dict):
+            raise ValueError('`kwargs` must be a dictionary.')
+        self.args = args
+        self.kwargs = kwargs
         # Set up evaluation counts
         self.nfev = 0
         self.njev = 0
         self.nit = 0
+        # Ipopt requests the objective, gradient, constraints and Jacobian
+        # at the same point several times per iteration, so the most recent
+        # values are kept until `x` changes.
+        self._cache = {'x': None, 'f': None, 'g': None, 'c': None,
+                       'J': None}
+
+    def _shutdown_workers(self):
+        """Stop the threads used for finite differences, if any. The wrapper
+        evaluates finite differences serially afterwards."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            for fd_jac in (self.jac, *self._constraint_jacs):
+                if isinstance(fd_jac, _FDJacobian):
+                    fd_jac.executor = None
+
+    def _update_cache(self, x):
+        # Ipopt passes a newly allocated copy of the current point to every
+        # callback, so the cached point is compared by value. Unlike hashing
+        # `x.tobytes()`, this needs no temporary bytes object.
+        if self._cache['x'] is None or not np.array_equal(x, self._cache['x']):
+            self._cache = {'x': np.array(x, dtype=float), 'f': None,
+                           'g': None, 'c': None, 'J': None}
+
+    def _eval_fun_jac(self, x):
+        self._update_cache(x)
+        if self._cache['f'] is None or self._cache['g'] is None:
+            self.nfev += 1
+            self.njev += 1
+            fg = self._fun_and_jac(x, *self.args, **self.kwargs)
+            self._cache['f'], self._cache['g'] = fg[0], fg[1]
 
     def evaluate_fun_with_grad(self, x):
         """ For backwards compatibility. """
         return (self.objective(x), self.gradient(x, **self.kwargs))
 
     def objective(self, x):
-        self.nfev += 1
-        return self.fun(x, *self.args, **self.kwargs)
+        if self._fun_and_jac is not None:
+            self._eval_fun_jac(x)
+            return self._cache['f']
+        self._update_cache(x)
+        if self._cache['f'] is None:
+            self.nfev += 1
+            self._cache['f'] = self.fun(x, *self.args, **self.kwargs)
+        return self._cache['f']
 
     # TODO : **kwargs is ignored, not sure why it is here.
     def gradient(self, x, **kwargs):
-        self.njev += 1
-        return self.jac(x, *self.args, **self.kwargs)  # .T
+        if self._fun_and_jac is not None:
+            self._eval_fun_jac(x)
+            return self._cache['g']
+        self._update_cache(x)
+        if self._cache['g'] is None:
+            self.njev += 1
+            if isinstance(self.jac, _FDJacobian):
+                # the finite differences start from the objective at `x`
+                g = self.jac.differentiate(x, self.args, self.kwargs,
+                                           f0=self.objective(x))
+            else:
+                g = self.jac(x, *self.args, **self.kwargs)  # .T
+            self._cache['g'] = g
+        return self._cache['g']
 
     def constraints(self, x):
-        con_values = []
-        for fun, args, kwargs in zip(self._constraint_funs,
-                                     self._constraint_args,
-                                     self._constraint_kwargs):
-            con_values.append(fun(x, *args, **kwargs))
-        return np.hstack(con_values)
+        self._update_cache(x)
+        if self._cache['c'] is not None:
+            return self._cache['c']
+        if len(self._constraint_funs) == 1:
+            # nothing to stack, so skip the copy into the buffer
+            con_val = self._constraint_funs[0](x, *self._constraint_args[0],
+                                               **self._constraint_kwargs[0])
+            self._cache['c'] = np.ascontiguousarray(con_val)
+            return self._cache['c']
+        for fun, args, kwargs, dest in self._con_steps:
+            dest[:] = np.ravel(fun(x, *args, **kwargs))
+        self._cache['c'] = self._con_buf
+        return self._cache['c']
 
     def jacobianstructure(self):
         return self._constraint_jacobian_structure
 
     def jacobian(self, x):
+        self._update_cache(x)
+        if self._cache['J'] is not None:
+            return self._cache['J']
+        if len(self._constraint_jacs) == 1:
+            jac_val = self._constraint_jacs[0](x, *self._constraint_args[0],
+                                               **self._constraint_kwargs[0])
+            if self._constraint_jac_is_sparse[0]:
+                self._cache['J'] = jac_val.data
+            else:
+                self._cache['J'] = np.ravel(jac_val)
+            return self._cache['J']
         # Convert all dense constraint jacobians to sparse ones.
         # The structure ( = row and column indices) is already known at this point,
-        # so we only need to stack the evaluated jacobians
-        jac_values = []
-        for i, (jac, args, kwargs) in enumerate(zip(self._constraint_jacs,
-                                                    self._constraint_args,
-                                                    self._constraint_kwargs)):
-            if self._constraint_jac_is_sparse[i]:
-                jac_val = jac(x, *args, **kwargs)
-                jac_values.append(jac_val.data)
-            else:
-                dense_jac_val = np.atleast_2d(jac(x, *args, **kwargs))
-                jac_values.append(dense_jac_val.ravel())
-        return np.hstack(jac_values)
+        # so we only need to copy the evaluated jacobians into place
+        for jac, args, kwargs, is_sparse, dest in self._jac_steps:
+            jac_val = jac(x, *args, **kwargs)
+            if is_sparse:
+                dest[:] = jac_val.data
+            elif dest is not None:
+                # copy through a 2-D view of the buffer; `ravel` would first
+                # copy non-contiguous values into a temporary array
+                np.copyto(dest, jac_val)
+        self._cache['J'] = self._jac_buf
+        return self._cache['J']
 
     def hessian(self, x, lagrange, obj_factor):
-        H = obj_factor * self.obj_hess(x, *self.args, **self.kwargs)  # type: ignore
-        # split the lagrangian multipliers for each constraint hessian
-        lagrs = np.split(lagrange, np.cumsum(self._constraint_dims[:-1]))
-        for hessian, args, kwargs, lagr in zip(self._constraint_hessians,
-                                               self._constraint_args,
-                                               self._constraint_kwargs, lagrs):
+        if self._n != x.size:
+            self._n = x.size
+            self._tril = np.tril_indices(self._n)
+            self._H_buf = np.empty((self._n, self._n))
+        obj_hess = self.obj_hess(x, *self.args, **self.kwargs)  # type: ignore
+        if isinstance(obj_hess, np.ndarray):
+            # accumulate the Hessian of the Lagrangian in place
+            H = self._H_buf
+            np.multiply(obj_factor, obj_hess, out=H)
+        else:
+            # a sparse objective Hessian cannot be written into the buffer
+            H = obj_factor * obj_hess
+        # the lagrangian multipliers of each constraint hessian are laid out
+        # like the constraint values
+        for i, (hessian, args, kwargs) in enumerate(zip(
+                self._constraint_hessians, self._constraint_args,
+                self._constraint_kwargs)):
+            lagr = lagrange[self._con_offsets[i]:self._con_offsets[i + 1]]
             H += hessian(x, lagr, *args, **kwargs)
-        return H[np.tril_indices(x.size)]
+        return H[self._tril]
 
     def intermediate(self, alg_mod, iter_count, obj_value, inf_pr, inf_du, mu,
                      d_norm, regularization_size, alpha_du, alpha_pr,
@@ -252,41 +461,112 @@ def get_bounds(bounds):
         return lb, ub
 
 
-def _get_sparse_jacobian_structure(constraints, x0):
+def _evaluate_constraint(con, x0):
+    """Return the value of a constraint at ``x0`` and its Jacobian, or
+    ``None`` if the Jacobian is approximated by finite differences."""
+    con_args = con.get('args', [])
+    con_kwargs = con.get('kwargs', {})
+    con_jac = con.get('jac', False)
+    if con_jac is True:
+        return con['fun'](x0, *con_args, **con_kwargs)
+    con_val = con['fun'](x0, *con_args, **con_kwargs)
+    jac_val = con_jac(x0, *con_args, **con_kwargs) if con_jac else None
+    return con_val, jac_val
+
+
+def _constraint_dimension(con, x0):
+    con_val = con['fun'](x0, *con.get('args', []), **con.get('kwargs', {}))
+    if con.get('jac', False) is True:
+        con_val = con_val[0]
+    return np.size(con_val)
+
+
+def _dense_rowcol(m, n, row_offset=0):
+    """Return the row and column indices of a dense (m, n) block, in row-major
+    order, whose first row is row ``row_offset`` of the stacked Jacobian."""
+    rows = np.repeat(np.arange(row_offset, row_offset + m), n)
+    cols = np.tile(np.arange(n), m)
+    return rows, cols
+
+
+def _analyze_constraints(constraints, x0, INF=1e19):
+    """Evaluate each constraint once at ``x0`` to determine the dimensions,
+    bounds, and Jacobian sparsity structure of the constraints.
+
+    Returns
+    -------
+    con_dims : ndarray
+        The dimension of each constraint.
+    cl, cu : ndarray
+        The lower and upper bounds of the stacked constraints.
+    con_jac_is_sparse : list of bool
+        Whether each constraint Jacobian is sparse.
+    jac_nnz_row, jac_nnz_col : ndarray
+        The row and column indices of the nonzero elements in the stacked
+        constraint Jacobian.
+    """
+    con_dims = []
+    cl = []
+    cu = []
     con_jac_is_sparse = []
-    jacobians = []
+    jac_structures = []
+    # The same constraint dict may be passed more than once; its evaluation
+    # at x0 is reused.
+    evaluated = {}
     x0 = np.asarray(x0)
     if isinstance(constraints, dict):
         constraints = (constraints, )
     if len(constraints) == 0:
-        return [], [], []
+        return np.array([]), np.array([]), np.array([]), [], [], []
     for con in constraints:
-        con_jac = con.get('jac', False)
-        if con_jac:
-            if isinstance(con_jac, bool):
-                _, jac_val = con['fun'](x0, *con.get('args', []),
-                                        **con.get('kwargs', {}))
-            else:
-                jac_val = con_jac(x0, *con.get('args', []),
-                                  **con.get('kwargs', {}))
-            # check if dense or sparse
-            if isinstance(jac_val, coo_array):
-                jacobians.append(jac_val)
-                con_jac_is_sparse.append(True)
-            else:
-                # Creating the coo_array from jac_val would yield to
-                # wrong dimensions if some values in jac_val are zero,
-                # so we assume all values in jac_val are nonzero
-                jacobians.append(coo_array(np.ones_like(np.atleast_2d(jac_val))))
-                con_jac_is_sparse.append(False)
+        if id(con) not in evaluated:
+            evaluated[id(con)] = _evaluate_constraint(con, x0)
+        con_val, jac_val = evaluated[id(con)]
+        m = np.size(con_val)
+        con_dims.append(m)
+        cl.append(np.zeros(m))
+        if con['type'] == 'eq':
+            cu.append(np.zeros(m))
+        elif con['type'] == 'ineq':
+            cu.append(np.full(m, INF))
+        else:
+            raise ValueError(con['type'])
+        if isinstance(jac_val, coo_array):
+            jac_structures.append((jac_val.row, jac_val.col))
+            con_jac_is_sparse.append(True)
         else:
-            # we approximate this jacobian later (=dense)
-            con_val = np.atleast_1d(con['fun'](x0, *con.get('args', []),
-                                               **con.get('kwargs', {})))
-            jacobians.append(coo_array(np.ones((con_val.size, x0.size))))
+            # A missing jacobian is approximated later (=dense).
+            # Deriving the structure from the values of a dense jac_val
+            # would drop entries that happen to be zero at x0,
+            # so we assume all values in jac_val are nonzero
+            if jac_val is None:
+                shape = (m, x0.size)
+            else:
+                shape = np.shape(np.atleast_2d(jac_val))
+            jac_structures.append(shape)
             con_jac_is_sparse.append(False)
-    J = scipy.sparse.vstack(jacobians)
-    return con_jac_is_sparse, J.row, J.col
+
+    if not any(con_jac_is_sparse):
+        # the stacked jacobian is dense, too
+        jac_nnz_row, jac_nnz_col = _dense_rowcol(sum(con_dims), x0.size)
+    else:
+        jac_rows = []
+        jac_cols = []
+        row_offset = 0
+        for m, is_sparse, structure in zip(con_dims, con_jac_is_sparse,
+                                           jac_structures):
+            if is_sparse:
+                rows, cols = structure
+                rows = rows + row_offset
+            else:
+                rows, cols = _dense_rowcol(*structure, row_offset=row_offset)
+            jac_rows.append(rows)
+            jac_cols.append(cols)
+            row_offset += m
+        jac_nnz_row = np.concatenate(jac_rows)
+        jac_nnz_col = np.concatenate(jac_cols)
+    return (np.array(con_dims), np.concatenate(cl), np.concatenate(cu),
+            con_jac_is_sparse, jac_nnz_row, jac_nnz_col)
 
 
 def get_constraint_dimensions(constraints, x0):
@@ -294,13 +574,7 @@ def get_constraint_dimensions(constraints, x0):
     if isinstance(constraints, dict):
         constraints = (constraints, )
     for con in constraints:
-        if con.get('jac', False) is True:
-            m = len(np.atleast_1d(con['fun'](x0, *con.get('args', []),
-                                             **con.get('kwargs', {}))[0]))
-        else:
-            m = len(np.atleast_1d(con['fun'](x0, *con.get('args', []),
-                                             **con.get('kwargs', {}))))
-        con_dims.append(m)
+        con_dims.append(_constraint_dimension(con, x0))
     return np.array(con_dims)
 
 
@@ -310,23 +584,21 @@ def get_constraint_bounds(constraints, x0, INF=1e19):
     if isinstance(constraints, dict):
         constraints = (constraints, )
     for con in constraints:
-        if con.get('jac', False) is True:
-            m = len(np.atleast_1d(con['fun'](x0, *con.get('args', []),
-                                             **con.get('kwargs', {}))[0]))
-        else:
-            m = len(np.atleast_1d(con['fun'](x0, *con.get('args', []),
-                                             **con.get('kwargs', {}))))
-        cl.extend(np.zeros(m))
+        m = _constraint_dimension(con, x0)
+        cl.append(np.zeros(m))
         if con['type'] == 'eq':
-            cu.extend(np.zeros(m))
+            cu.append(np.zeros(m))
         elif con['type'] == 'ineq':
-            cu.extend(INF * np.ones(m))
+            cu.append(np.full(m, INF))
         else:
             raise ValueError(con['type'])
-    cl = np.array(cl)
-    cu = np.array(cu)
+    if not cl:
+        return np.array([]), np.array([])
+    return np.concatenate(cl), np.concatenate(cu)
+
 
-    return cl, cu
+# SciPy option names and their Ipopt equivalents
+_SCIPY_OPTION_NAMES = {b'disp': b'print_level', b'maxiter': b'max_iter'}
 
 
 def replace_option(options, oldname, newname):
@@ -336,14 +608,12 @@ def replace_option(options, oldname, newname):
 
 
 def convert_to_bytes(options):
-    if sys.version_info >= (3, 0):
-        for key in list(options.keys()):
-            try:
-                if bytes(key, 'utf-8') != key:
-                    options[bytes(key, 'utf-8')] = options[key]
-                    options.pop(key)
-            except TypeError:
-                pass
+    encoded = {(key.encode('utf-8') if isinstance(key, str) else key): value
+               for key, value in options.items()}
+    # update in place for callers that rely on `options` being modified
+    options.clear()
+    options.update(encoded)
+    return options
 
 
 def _wrap_fun(fun, kwargs):
@@ -385,7 +655,8 @@ def minimize_ipopt(fun,
                    constraints=(),
                    tol=None,
                    callback=None,
-                   options=None):
+                   options=None,
+                   cache=False):
     """
     Minimization using Ipopt with an interface like
     :py:func:`scipy.optimize.minimize`.
@@ -440,7 +711,8 @@ def minimize_ipopt(fun,
     jac : callable, optional
         The Jacobian (gradient) of the objective function:
         ``jac(x, *args, **kwargs) -> ndarray, shape(n, )``.
-        If ``None``, SciPy's ``approx_fprime`` is used.
+        If ``None``, a forward difference approximation (as in SciPy's
+        ``approx_fprime``) is used.
     hess : callable, optional
         The Hessian of the objective function:
         ``hess(x) -> ndarray, shape(n, )``.
@@ -478,8 +750,11 @@ def minimize_ipopt(fun,
         ``disp`` and ``maxiter`` are automatically mapped to their Ipopt
         equivalents ``print_level`` and ``max_iter``, and ``eps`` is used to
         control the step size of finite difference gradient and constraint
-        Jacobian approximations. All other options are passed directly
-        to Ipopt. See [1]_ for details.
+        Jacobian approximations. ``workers`` sets the number of threads used
+        to evaluate these approximations (default: 1, ``-1`` uses all
+        CPUs); use more than one only if the functions are thread-safe.
+        All other options are passed directly to Ipopt. See [1]_ for
+        details.
 
         For other values of `method`, `options` is passed to the SciPy solver.
         See [2]_ for details.
@@ -487,6 +762,21 @@ def minimize_ipopt(fun,
         This argument is ignored by the default `method` (Ipopt).
         If `method` is one of the SciPy methods, this is a callable that is
         called once per iteration. See [2]_ for details.
+    cache : bool, optional (default=False)
+        If ``True`` and `method` is unspecified (default: Ipopt), the Ipopt
+        problem is kept and reused by later calls with the same `fun`,
+        `jac`, `hess`, `constraints`, bounds and `options`, which skips the
+        evaluation of the constraints at `x0` and the setup of the problem.
+        The functions and constraints are compared by identity, so
+        constraint objects such as
+        :py:class:`scipy.optimize.NonlinearConstraint` must be the same
+        instances, too. Only `x0`, `args` and `kwargs` may differ between
+        such calls: the constraint dimensions and Jacobian sparsity
+        structure are those found at the first `x0`, and changes to the
+        contents of the constraints are not detected. Cached problems keep
+        the user functions alive. A cached problem is only solved by one
+        call at a time; a concurrent or nested call with the same arguments
+        sets up and solves a new problem instead.
 
     References
     ----------
@@ -503,7 +793,7 @@ def minimize_ipopt(fun,
     :py:func:`scipy.optimize.rosen_hess`.
 
     >>> from cyipopt import minimize_ipopt
-    >>> from scipy.optimize import rosen, rosen_der
+    >>> from scipy.optimize import rosen, rosen_der, rosen_hess
     >>> x0 = [1.3, 0.7, 0.8, 1.9, 1.2]  # initial guess
 
     If we provide the objective function but no derivatives, Ipopt finds the
@@ -514,13 +804,13 @@ def minimize_ipopt(fun,
     approximate the gradient, and still the approximation is not very accurate,
     delaying convergence.
 
-    >>> res = minimize_ipopt(rosen, x0, jac=rosen_der)
+    >>> res = minimize_ipopt(rosen, x0)
     >>> res.success
     False
     >>> res.x
-    array([1., 1., 1., 1., 1.])
+    array([0.9999995 , 0.99999901, 0.99999802, 0.99999606, 0.99999211])
     >>> res.nit, res.nfev, res.njev
-    (46, 528, 48)
+    (46, 446, 47)
 
     To improve performance, provide the gradient using the `jac` keyword.
     In this case, Ipopt recognizes its own success, and requires fewer function
@@ -530,7 +820,7 @@ def minimize_ipopt(fun,
     >>> res.success
     True
     >>> res.nit, res.nfev, res.njev
-    (37, 200, 39)
+    (37, 139, 38)
 
     For best results, provide the Hessian, too.
 
@@ -538,12 +828,19 @@ def minimize_ipopt(fun,
     >>> res.success
     True
     >>> res.nit, res.nfev, res.njev
-    (17, 29, 19)
+    (17, 23, 18)
     """
     if not SCIPY_INSTALLED:
         msg = 'Install SciPy to use the `minimize_ipopt` function.'
         raise ImportError(msg)
 
+    # `_minimize_ipopt_iv` converts new-style constraints to new dictionaries
+    # on every call, so problems are cached by the constraints passed in.
+    if isinstance(constraints, (list, tuple)):
+        user_constraints = tuple(constraints)
+    else:
+        user_constraints = (constraints, )
+
     res = _minimize_ipopt_iv(fun, x0, args, kwargs, method, jac, hess, hessp,
                              bounds, constraints, tol, callback, options)
     (fun, x0, args, kwargs, method, jac, hess, hessp,
@@ -560,42 +857,17 @@ def minimize_ipopt(fun,
     _x0 = np.atleast_1d(x0)
 
     lb, ub = bounds
-    cl, cu = get_constraint_bounds(constraints, _x0)
-    con_dims = get_constraint_dimensions(constraints, _x0)
-    sparse_jacs, jac_nnz_row, jac_nnz_col = _get_sparse_jacobian_structure(
-        constraints, x0)
 
     if options is None:
         options = {}
     eps = options.pop('eps', 1e-8)
+    workers = options.pop('workers', 1)
 
-    problem = IpoptProblemWrapper(fun,
-                                  args=args,
-                                  kwargs=kwargs,
-                                  jac=jac,
-                                  hess=hess,
-                                  hessp=hessp,
-                                  constraints=constraints,
-                                  eps=eps,
-                                  con_dims=con_dims,
-                                  sparse_jacs=sparse_jacs,
-                                  jac_nnz_row=jac_nnz_row,
-                                  jac_nnz_col=jac_nnz_col)
-
-    nlp = cyipopt.Problem(n=len(x0),
-                          m=len(cl),
-                          problem_obj=problem,
-                          lb=lb,
-                          ub=ub,
-                          cl=cl,
-                          cu=cu)
-
-    # python3 compatibility
-    convert_to_bytes(options)
+    options = convert_to_bytes(options)
 
     # Rename some default scipy options
-    replace_option(options, b'disp', b'print_level')
-    replace_option(options, b'maxiter', b'max_iter')
+    for oldname, newname in _SCIPY_OPTION_NAMES.items():
+        replace_option(options, oldname, newname)
     if getattr(options, 'print_level', False) is True:
         options[b'print_level'] = 1
     else:
@@ -607,14 +879,80 @@ def minimize_ipopt(fun,
     if b'hessian_approximation' not in options:
         if hess is None and hessp is None:
             options[b'hessian_approximation'] = b'limited-memory'
-    for option, value in options.items():
-        try:
-            nlp.add_option(option, value)
-        except TypeError as e:
-            msg = 'Invalid option for IPOPT: {0}: {1} (Original message: "{2}")'
-            raise TypeError(msg.format(option, value, e))
 
-    x, info = nlp.solve(x0)
+    key = None
+    lock = None
+    if cache:
+        key = _problem_cache_key(fun, jac, hess, user_constraints, lb, ub,
+                                 eps, workers, options)
+    if key is not None:
+        with _PROBLEM_CACHE_LOCK:
+            entry = _PROBLEM_CACHE.get(key)
+            # a cached problem that is being solved by another (concurrent
+            # or nested) call is not shared
+            if entry is not None and entry[2].acquire(blocking=False):
+                problem, nlp, lock, _ = entry
+    if lock is not None:
+        problem._reset(args, kwargs)
+    else:
+        (con_dims, cl, cu, sparse_jacs, jac_nnz_row,
+         jac_nnz_col) = _analyze_constraints(constraints, _x0)
+
+        problem = IpoptProblemWrapper(fun,
+                                      args=args,
+                                      kwargs=kwargs,
+                                      jac=jac,
+                                      hess=hess,
+                                      hessp=hessp,
+                                      constraints=constraints,
+                                      eps=eps,
+                                      workers=workers,
+                                      con_dims=con_dims,
+                                      sparse_jacs=sparse_jacs,
+                                      jac_nnz_row=jac_nnz_row,
+                                      jac_nnz_col=jac_nnz_col)
+
+        nlp = cyipopt.Problem(n=len(x0),
+                              m=len(cl),
+                              problem_obj=problem,
+                              lb=lb,
+                              ub=ub,
+                              cl=cl,
+                              cu=cu)
+
+        for option, value in options.items():
+            try:
+                nlp.add_option(option, value)
+            except TypeError as e:
+                msg = 'Invalid option for IPOPT: {0}: {1} (Original message: "{2}")'
+                raise TypeError(msg.format(option, value, e))
+
+        if key is not None:
+            with _PROBLEM_CACHE_LOCK:
+                if key not in _PROBLEM_CACHE:
+                    _evict_cached_problems(_PROBLEM_CACHE_SIZE - 1)
+                    lock = threading.Lock()
+                    lock.acquire()
+                    _PROBLEM_CACHE[key] = (problem, nlp, lock,
+                                           (fun, jac, hess, user_constraints))
+
+    try:
+        x, info = nlp.solve(x0)
+    except BaseException:
+        if lock is not None:
+            # `nlp` raises the exception of a callback again in every later
+            # solve, so the problem cannot be reused
+            with _PROBLEM_CACHE_LOCK:
+                if _PROBLEM_CACHE.get(key, (None, ))[0] is problem:
+                    del _PROBLEM_CACHE[key]
+        problem._shutdown_workers()
+        raise
+    finally:
+        if lock is not None:
+            lock.release()
+    if lock is None:
+        # cached problems keep their threads for the next solve
+        problem._shutdown_workers()
 
     return OptimizeResult(x=x,
                           success=info['status'] == 0,
@@ -627,6 +965,38 @@ def minimize_ipopt(fun,
                           nit=problem.nit)
 
 
+# Problems built by `minimize_ipopt(..., cache=True)`, keyed by
+# `_problem_cache_key`. Each entry is `(problem, nlp, lock, refs)`: `lock` is
+# held while the problem is being solved, and `refs` are strong references to
+# the objects whose ids make up the key, so that the ids cannot be reused
+# while cached. `_PROBLEM_CACHE_LOCK` guards the dictionary itself.
+_PROBLEM_CACHE = {}
+_PROBLEM_CACHE_SIZE = 8
+_PROBLEM_CACHE_LOCK = threading.Lock()
+
+
+def _evict_cached_problems(size):
+    # drop the oldest entries until at most `size` are left
+    while len(_PROBLEM_CACHE) > size:
+        problem, _, lock, _ = _PROBLEM_CACHE.pop(next(iter(_PROBLEM_CACHE)))
+        # a problem that is still being solved stops its threads when it is
+        # garbage collected
+        if lock.acquire(blocking=False):
+            problem._shutdown_workers()
+            lock.release()
+
+
+def _problem_cache_key(fun, jac, hess, constraints, lb, ub, eps, workers,
+                       options):
+    key = (id(fun), id(jac), id(hess), tuple(id(con) for con in constraints),
+           lb.tobytes(), ub.tobytes(), eps, workers, tuple(options.items()))
+    try:
+        hash(key)
+    except TypeError:  # unhashable option values are not cached
+        return None
+    return key
+
+
 def _minimize_ipopt_iv(fun, x0, args, kwargs, method, jac, hess, hessp,
                        bounds, constraints, tol, callback, options):
     # basic input validation for minimize_ipopt that is not included in
@@ -8,6 +8,7 @@ which requires SciPy.
 
 import re
 import sys
+import threading
 
 import numpy as np
 import pytest
@@ -613,3 +614,265 @@ def test_gh115_eps_option():
     eps = 1e-9
     cyipopt.minimize_ipopt(f, x0=0, options={'eps': eps})
     np.testing.assert_equal(f.dx, eps)
+
+
+@pytest.mark.skipif("scipy" not in sys.modules,
+                    reason="Test only valid if Scipy available.")
+def test_problem_wrapper_memoizes_evaluations():
+    # Ipopt asks for the objective, gradient, constraints and Jacobian at the
+    # same point several times; the user functions should only be evaluated
+    # once per point.
+    def fun(x):
+        fun.count += 1
+        return x @ x
+
+    def grad(x):
+        grad.count += 1
+        return 2 * x
+
+    def con(x):
+        con.count += 1
+        return x[0] + x[1]
+
+    def con_jac(x):
+        con_jac.count += 1
+        return np.array([[1.0, 1.0]])
+
+    fun.count, grad.count, con.count, con_jac.count = 0, 0, 0, 0
+    constr = {'type': 'eq', 'fun': con, 'jac': con_jac}
+    problem = cyipopt.IpoptProblemWrapper(fun, jac=grad, constraints=constr,
+                                          con_dims=[1], sparse_jacs=[False],
+                                          jac_nnz_row=[0, 0],
+                                          jac_nnz_col=[0, 1])
+    x = np.array([1.0, 2.0])
+    for _ in range(3):
+        assert problem.objective(x) == 5.0
+        np.testing.assert_equal(problem.gradient(x), [2.0, 4.0])
+        np.testing.assert_equal(problem.constraints(x.copy()), [3.0])
+        np.testing.assert_equal(problem.jacobian(x), [1.0, 1.0])
+    assert (fun.count, grad.count, con.count, con_jac.count) == (1, 1, 1, 1)
+    assert (problem.nfev, problem.njev) == (1, 1)
+
+    problem.objective(x + 1)
+    assert fun.count == 2
+
+
+@pytest.mark.skipif("scipy" not in sys.modules,
+                    reason="Test only valid if Scipy available.")
+def test_problem_wrapper_constraint_structure_iv():
+    constr = [{'type': 'eq', 'fun': lambda x: x[0]},
+              {'type': 'eq', 'fun': lambda x: x[1:]}]
+
+    message = "`con_dims` and `sparse_jacs` must have one entry per"
+    with pytest.raises(ValueError, match=message):
+        cyipopt.IpoptProblemWrapper(lambda x: x @ x, constraints=constr)
+    with pytest.raises(ValueError, match=message):
+        cyipopt.IpoptProblemWrapper(lambda x: x @ x, constraints=constr,
+                                    con_dims=[1, 2], sparse_jacs=[False])
+
+    message = "`jac_nnz_row` and `jac_nnz_col` must have the same length."
+    with pytest.raises(ValueError, match=message):
+        cyipopt.IpoptProblemWrapper(lambda x: x @ x, constraints=constr,
+                                    con_dims=[1, 2],
+                                    sparse_jacs=[False, False],
+                                    jac_nnz_row=[0, 1, 2], jac_nnz_col=[0])
+
+
+@pytest.mark.skipif("scipy" not in sys.modules,
+                    reason="Test only valid if Scipy available.")
+def test_problem_wrapper_jac_true_single_evaluation():
+    # With `jac=True`, the objective and gradient come from the same call.
+    def fun_and_grad(x, a):
+        fun_and_grad.count += 1
+        return a * (x @ x), 2 * a * x
+
+    fun_and_grad.count = 0
+    problem = cyipopt.IpoptProblemWrapper(fun_and_grad, args=(2.0,),
+                                          jac=True)
+    x = np.array([1.0, 2.0])
+    f, g = problem.evaluate_fun_with_grad(x)
+    assert f == 10.0
+    np.testing.assert_equal(g, [4.0, 8.0])
+    np.testing.assert_equal(problem.gradient(x), [4.0, 8.0])
+    assert problem.objective(x) == 10.0
+    assert fun_and_grad.count == 1
+
+    np.testing.assert_equal(problem.gradient(2 * x), [8.0, 16.0])
+    assert problem.objective(2 * x) == 40.0
+    assert fun_and_grad.count == 2
+
+
+@pytest.mark.skipif("scipy" not in sys.modules,
+                    reason="Test only valid if Scipy available.")
+def test_analyze_constraints_evaluates_once():
+    from cyipopt.scipy_interface import _analyze_constraints
+
+    def con_eq(x):
+        con_eq.count += 1
+        return x[0] - 1
+
+    def con_ineq_and_jac(x):
+        con_ineq_and_jac.count += 1
+        return x[:2], np.eye(2, 3)
+
+    con_eq.count, con_ineq_and_jac.count = 0, 0
+    constraints = ({'type': 'eq', 'fun': con_eq},
+                   {'type': 'ineq', 'fun': con_ineq_and_jac, 'jac': True})
+    res = _analyze_constraints(constraints, np.ones(3))
+    con_dims, cl, cu, sparse_jacs, jac_nnz_row, jac_nnz_col = res
+    assert con_eq.count == 1
+    assert con_ineq_and_jac.count == 1
+    np.testing.assert_equal(con_dims, [1, 2])
+    np.testing.assert_equal(cl, [0, 0, 0])
+    np.testing.assert_equal(cu, [0, 1e19, 1e19])
+    assert sparse_jacs == [False, False]
+    np.testing.assert_equal(jac_nnz_row, [0, 0, 0, 1, 1, 1, 2, 2, 2])
+    np.testing.assert_equal(jac_nnz_col, [0, 1, 2, 0, 1, 2, 0, 1, 2])
+
+    # a constraint that is passed twice is only evaluated once
+    con_eq.count = 0
+    constraints = ({'type': 'eq', 'fun': con_eq}, ) * 2
+    con_dims, cl, cu, *_ = _analyze_constraints(constraints, np.ones(3))
+    assert con_eq.count == 1
+    np.testing.assert_equal(con_dims, [1, 1])
+
+
+@pytest.mark.skipif("scipy" not in sys.modules,
+                    reason="Test only valid if Scipy available.")
+def test_problem_wrapper_sparse_objective_hessian():
+    from scipy.sparse import csr_array
+
+    x = np.array([1.0, 2.0, 3.0])
+    constr = {'type': 'ineq', 'fun': lambda x: x[0],
+              'hess': lambda x, v: v[0] * np.eye(3)}
+    problem = cyipopt.IpoptProblemWrapper(
+        lambda x: x @ x, hess=lambda x: csr_array(np.diag([2.0, 4.0, 5.0])),
+        constraints=constr, con_dims=[1], sparse_jacs=[False],
+        jac_nnz_row=[0, 0, 0], jac_nnz_col=[0, 1, 2])
+    np.testing.assert_equal(problem.hessian(x, np.zeros(1), 1.0),
+                            [2, 0, 4, 0, 0, 5])
+    np.testing.assert_equal(problem.hessian(x, np.ones(1), 2.0),
+                            [5, 0, 9, 0, 0, 11])
+
+
+@pytest.mark.skipif("scipy" not in sys.modules,
+                    reason="Test only valid if Scipy available.")
+@pytest.mark.parametrize('workers', [1, 2, -1])
+def test_finite_difference_workers(workers):
+    from scipy.optimize import approx_fprime, rosen
+
+    x = np.array([1.3, 0.7, 0.8, 1.9, 1.2])
+    problem = cyipopt.IpoptProblemWrapper(rosen, workers=workers)
+    np.testing.assert_allclose(problem.gradient(x),
+                               approx_fprime(x, rosen, 1e-8))
+
+    options = {'tol': 1e-7, 'workers': workers}
+    res = cyipopt.minimize_ipopt(rosen, x, options=options.copy())
+    assert res.success
+    np.testing.assert_allclose(res.x, np.ones(5), rtol=1e-5)
+
+    # the objective and constraints share one thread pool, which is shut
+    # down after the solve
+    n_threads = threading.active_count()
+    constr = [{'type': 'ineq', 'fun': lambda x, i=i: 10 - x[i]}
+              for i in range(5)]
+    res = cyipopt.minimize_ipopt(rosen, x, constraints=constr,
+                                 options=options.copy())
+    np.testing.assert_allclose(res.x, np.ones(5), rtol=1e-5)
+    assert threading.active_count() == n_threads
+
+
+@pytest.mark.skipif("scipy" not in sys.modules,
+                    reason="Test only valid if Scipy available.")
+def test_problem_wrapper_positional_arguments():
+    # `workers` comes after the arguments that existed before it
+    constr = {'type': 'eq', 'fun': lambda x: x[0] + x[1]}
+    problem = cyipopt.IpoptProblemWrapper(lambda x: x @ x, (), None, None,
+                                          None, None, constr, 1e-8, [1],
+                                          [False], [0, 0], [0, 1])
+    x = np.array([1.0, 2.0])
+    np.testing.assert_equal(problem.constraints(x), [3.0])
+    np.testing.assert_allclose(problem.jacobian(x), [1.0, 1.0])
+
+
+@pytest.mark.skipif("scipy" not in sys.modules,
+                    reason="Test only valid if Scipy available.")
+@pytest.mark.parametrize('workers', [0, -2, 1.5, True])
+def test_finite_difference_workers_iv(workers):
+    from scipy.optimize import rosen
+
+    message = "`workers` must be a positive integer or -1."
+    with pytest.raises(ValueError, match=message):
+        cyipopt.minimize_ipopt(rosen, np.ones(5),
+                               options={'workers': workers})
+
+
+@pytest.mark.skipif("scipy" not in sys.modules,
+                    reason="Test only valid if Scipy available.")
+def test_minimize_ipopt_cache():
+    from scipy.optimize import NonlinearConstraint
+    from cyipopt.scipy_interface import _PROBLEM_CACHE
+
+    def fun(x, a):
+        return (x[0] - a) ** 2 + (x[1] - 2) ** 2
+
+    constr = [{'type': 'ineq', 'fun': lambda x: x[0] + x[1] - 1}]
+    _PROBLEM_CACHE.clear()
+
+    res1 = cyipopt.minimize_ipopt(fun, [0, 0], args=(1.0,),
+                                  constraints=constr, cache=True)
+    assert len(_PROBLEM_CACHE) == 1
+    (problem, nlp, _, _), = _PROBLEM_CACHE.values()
+
+    # the cached problem is reused with the new `x0` and `args`
+    res2 = cyipopt.minimize_ipopt(fun, [0.5, 0.5], args=(3.0,),
+                                  constraints=constr, cache=True)
+    assert len(_PROBLEM_CACHE) == 1
+    (problem2, nlp2, _, _), = _PROBLEM_CACHE.values()
+    assert problem2 is problem and nlp2 is nlp
+    assert res1.success and res2.success
+    np.testing.assert_allclose(res1.x, [1, 2], rtol=1e-6)
+    np.testing.assert_allclose(res2.x, [3, 2], rtol=1e-6)
+
+    # without `cache`, nothing is stored
+    cyipopt.minimize_ipopt(fun, [0, 0], args=(1.0,), constraints=constr)
+    assert len(_PROBLEM_CACHE) == 1
+    _PROBLEM_CACHE.clear()
+
+    # new-style constraints are cached by the instance that is passed in
+    constr = NonlinearConstraint(lambda x: x[0] + x[1], 1, np.inf)
+    cyipopt.minimize_ipopt(fun, [0, 0], args=(1.0,), constraints=constr,
+                           cache=True)
+    res = cyipopt.minimize_ipopt(fun, [0, 0], args=(3.0,),
+                                 constraints=constr, cache=True)
+    assert len(_PROBLEM_CACHE) == 1
+    np.testing.assert_allclose(res.x, [3, 2], rtol=1e-6)
+
+    # a problem that is being solved is not shared with another call
+    (problem, nlp, lock, _), = _PROBLEM_CACHE.values()
+    with lock:
+        res = cyipopt.minimize_ipopt(fun, [0, 0], args=(1.0,),
+                                     constraints=constr, cache=True)
+        np.testing.assert_allclose(res.x, [1, 2], rtol=1e-6)
+        assert problem.kwargs == {} and problem.args == (3.0,)
+    (problem2, _, _, _), = _PROBLEM_CACHE.values()
+    assert problem2 is problem
+
+    # a problem whose solve raised an exception is not reused
+    def fun_raises(x, a):
+        if fun_raises.fail:
+            fun_raises.fail = False
+            raise RuntimeError('boom')
+        return fun(x, a)
+
+    fun_raises.fail = True
+    with pytest.raises(RuntimeError, match='boom'):
+        cyipopt.minimize_ipopt(fun_raises, [0, 0], args=(3.0,),
+                               constraints=constr, cache=True)
+    assert len(_PROBLEM_CACHE) == 1
+    res = cyipopt.minimize_ipopt(fun_raises, [0, 0], args=(3.0,),
+                                 constraints=constr, cache=True)
+    assert res.success
+    np.testing.assert_allclose(res.x, [3, 2], rtol=1e-6)
+    assert len(_PROBLEM_CACHE) == 2
+    _PROBLEM_CACHE.clear()